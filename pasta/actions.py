@@ -1,20 +1,29 @@
 """The `action` module contains the interactive action performed by the user."""
-import time
+import dataclasses
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
-import pydantic
 
-
-class Action(pydantic.BaseModel):
+@dataclasses.dataclass(slots=True, frozen=True, kw_only=True)
+class Action:
     """Action is an interactive action performed."""
 
-    id: uuid.UUID = pydantic.Field(default_factory=uuid.uuid4)
+    id: bytes = dataclasses.field(default_factory=lambda: uuid.uuid4().bytes)
     prompt_ps1: bytes
     command_input: bytes
     command_output: bytes
     command_error: bytes = b""
     typescript: bytes
-    time_started: datetime
+    time_started_ns: int
     time_elapsed: float
     # shell_guess: str
+
+    @property
+    def uuid(self) -> uuid.UUID:
+        """Return the Action id as a UUID."""
+        return uuid.UUID(bytes=self.id)
+
+    @property
+    def time_started(self) -> datetime:
+        """Return the Action start time in UTC."""
+        return datetime.fromtimestamp(self.time_started_ns / 1e9, tz=timezone.utc)
@@ -1,30 +1,109 @@
 """The `cmd` module is a command line application."""
+import atexit
+import functools
+import io
 import logging
 import logging.handlers as logging_handlers
 import os
 import pathlib
+import queue
 import shlex
 import sys
 import time
 
 import click
-import stransi
 
 from .config import Config
 from .pty import PseudoTerminal
 from .shell import Event
 from .version import __version__
 
+_LOG_FORMAT = "%(asctime)s : %(name)s : %(cmd)s : %(levelname)s : %(message)s"
+
+# context meta key of the log QueueListener
+_LISTENER = "pasta.log_listener"
+
+_join = functools.lru_cache(maxsize=256)(shlex.join)
+
+logger = logging.getLogger(__package__)
+
+try:
+    _STDOUT_FD = sys.stdout.fileno()
+    _STDERR_FD = sys.stderr.fileno()
+except (AttributeError, ValueError, io.UnsupportedOperation):
+    # standard streams were replaced e.g. captured by a test runner
+    _STDOUT_FD = 1
+    _STDERR_FD = 2
+
+_BANNER_START = click.style(
+    "Pasta started, output log directory is '%s'.", fg="red", bold=True
+)
+_BANNER_DONE = click.style("Pasta done.", fg="red", bold=True)
+
+_LF = b"\n"
+_CRLF = b"\r\n"
+
+_OUTBUF_WATERLEVEL = 65536
+_OUTBUF_IOV_MAX = 1024
+
+
+class _OutputBuffer:
+    """Write-behind buffer for the standard output file descriptors.
+
+    Chunks are kept in write order as a run for one file descriptor at a time, so
+    interleaved standard output and standard error reach the terminal in order.
+    """
+
+    def __init__(self) -> None:
+        self.fd = -1
+        self.chunks: list[bytes] = []
+        self.size = 0
+
+    def write(self, fd: int, b: bytes) -> None:
+        """Buffer bytes for a file descriptor, flushing at the waterlevel."""
+        if fd != self.fd:
+            self.flush()
+            self.fd = fd
+
+        self.chunks.append(b)
+        self.size += len(b)
+        if self.size >= _OUTBUF_WATERLEVEL or len(self.chunks) >= _OUTBUF_IOV_MAX:
+            self.flush()
+
+    def flush(self) -> None:
+        """Flush buffered bytes with a single vectored write."""
+        if not self.chunks:
+            return
+
+        n = os.writev(self.fd, self.chunks)
+        if n < self.size:
+            # short write, fall back to draining the remainder
+            remainder = memoryview(b"".join(self.chunks))[n:]
+            while remainder:
+                n = os.write(self.fd, remainder)
+                remainder = remainder[n:]
+
+        self.chunks.clear()
+        self.size = 0
+
+
+_outbuf = _OutputBuffer()
+
+
+def _cbreak(b: bytes) -> bytes:
+    """Translate line feeds for a terminal in raw mode."""
+    if b.find(_LF) < 0:
+        return b
+
+    return b.replace(_LF, _CRLF)
+
 
 def stdin(b: bytes) -> bytes:
     if b == b"EOF":
         return b
 
-    cbreak = b.replace(b"\n", b"\r\n")
-    os.write(sys.stdout.fileno(), cbreak)
-    # if b"\r\n" in b:
-    #     print([d for d in stransi.Ansi(b).escapes()], flush=True)
-
+    cbreak = _cbreak(b)
+    _outbuf.write(_STDOUT_FD, cbreak)
     return b
 
 
@@ -32,17 +111,73 @@ def stdout(b: bytes) -> bytes:
     if b == b"EOF":
         return b
 
-    cbreak = b.replace(b"\n", b"\r\n")
-    os.write(sys.stdout.fileno(), cbreak)
+    cbreak = _cbreak(b)
+    _outbuf.write(_STDOUT_FD, cbreak)
     return b
 
 
 def stderr(b: bytes) -> bytes:
-    cbreak = b.replace(b"\n", b"\r\n")
-    os.write(sys.stderr.fileno(), cbreak)
+    cbreak = _cbreak(b)
+    _outbuf.write(_STDERR_FD, cbreak)
     return b
 
 
+class LazyFileHandler(logging.Handler):
+    """LazyFileHandler defers creating a rotating log file until the first record.
+
+    Attributes
+    ----------
+    directory
+        Log directory, created on the first record if missing.
+    max_bytes
+        Max log file size in bytes before rotating.
+    backups
+        Log backup count to retain.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        max_bytes: int = 0,
+        backups: int = 0,
+        level: int = logging.NOTSET,
+    ) -> None:
+        super().__init__(level=level)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._handler: logging_handlers.RotatingFileHandler | None = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Emit a record, opening the log file on the first record."""
+        try:
+            if self._handler is None:
+                path = pathlib.Path(self.directory)
+                path.mkdir(parents=True, exist_ok=True)
+                self._handler = logging_handlers.RotatingFileHandler(
+                    filename=str(path.joinpath(f"{time.time_ns()}.log")),
+                    maxBytes=self.max_bytes,
+                    backupCount=self.backups,
+                )
+                self._handler.setFormatter(self.formatter)
+
+            self._handler.emit(record)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        """Flush the log file, if opened."""
+        if self._handler is not None:
+            self._handler.flush()
+
+    def close(self) -> None:
+        """Close the log file, if opened."""
+        if self._handler is not None:
+            self._handler.close()
+
+        super().close()
+
+
 def print_version(ctx, param: click.Parameter, value: bool) -> None:
     if not value or ctx.resilient_parsing:
         return
@@ -86,13 +221,11 @@ def root(
 ) -> None:
     """Pasta is an interactive shell recorder for red team observability."""
     if config is not None:
-        with pathlib.Path(config).open(mode="rb") as handle:
-            conf = Config.load(handle)
+        conf = Config.load_path(config)
     else:
         config_path = Config.find()
         if config_path is not None:
-            with pathlib.Path(config_path).open(mode="rb") as handle:
-                conf = Config.load(handle)
+            conf = Config.load_path(config_path)
         else:
             conf = Config()
 
@@ -109,24 +242,29 @@ def root(
         conf.logging.max_size = log_max_size
 
     if log_backups is not None:
-        conf.logging.directory = log_backups
+        conf.logging.backups = log_backups
 
     ctx.obj = conf
 
-    path = pathlib.Path(conf.logging.directory)
-    path.mkdir(parents=True, exist_ok=True)
-    logging.basicConfig(
-        level=conf.logging.level,
-        format="%(asctime)s : %(name)s : %(levelname)s : %(message)s",
-        handlers=[
-            logging_handlers.RotatingFileHandler(
-                filename=str(path.joinpath(f"{time.time_ns()}.log")),
-                maxBytes=conf.logging.max_size * pow(10, 6),
-                backupCount=conf.logging.backups,
-            )
-        ],
+    handler = LazyFileHandler(
+        conf.logging.directory,
+        max_bytes=conf.logging.max_size * 1_000_000,
+        backups=conf.logging.backups,
+    )
+    handler.setFormatter(logging.Formatter(_LOG_FORMAT, defaults={"cmd": "-"}))
+
+    # write log records to the file from a background thread, off the pty loop,
+    # started by the commands that log
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    ctx.meta[_LISTENER] = logging_handlers.QueueListener(
+        records, handler, respect_handler_level=True
     )
 
+    # not basicConfig, which would replace the handler's default formatter
+    root_logger = logging.getLogger()
+    root_logger.setLevel(conf.logging.level)
+    root_logger.addHandler(logging_handlers.QueueHandler(records))
+
 
 @root.command(
     name="wrap",
@@ -163,36 +301,41 @@ def root_wrap(
 ) -> None:
     """Wrap a command and capture its output."""
     config: Config = ctx.obj
-    cmd = shlex.join(args)
-    logger = logging.getLogger(name=cmd)
-    term = PseudoTerminal(config, logger=logger)
-    with term.spool(cmd, cwd=chdir, echo=echo, timeout=timeout) as ts:
+
+    # fail on a bad log directory before spool puts the terminal in raw mode
+    try:
+        pathlib.Path(config.logging.directory).mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        raise click.FileError(str(config.logging.directory), hint=e.strerror) from e
+
+    listener: logging_handlers.QueueListener = ctx.meta[_LISTENER]
+    listener.start()
+    atexit.register(listener.stop)
+
+    cmd = _join(args)
+    log = logging.LoggerAdapter(logger, extra={"cmd": cmd})
+    term = PseudoTerminal(config, logger=log)
+    with term.spool(args, cwd=chdir, echo=echo, timeout=timeout) as ts:
         ts.addHandler(Event.STDIN, stdin)
         ts.addHandler(Event.STDOUT, stdout)
         ts.addHandler(Event.STDERR, stderr)
-        click.echo(
-            click.style(
-                "Pasta started, output log directory is '%s'."
-                % config.logging.directory,
-                fg="red",
-                bold=True,
-            )
-        )
+        ts.addFlusher(_outbuf.flush)
+        click.echo(_BANNER_START % config.logging.directory)
 
     for action in ts.actions:
-        logger.info(
-            "Action {} started at {} and executed for {} seconds -->\nPrompt:\n{}\nStdin:\n{}\nStdout:\n{}\nStderr:\n{}\n".format(
-                action.id,
-                action.time_started.isoformat(),
-                action.time_elapsed,
-                action.prompt_ps1,
-                action.command_input,
-                action.command_output,
-                action.command_error,
-            )
+        log.info(
+            "Action %s started at %s and executed for %s seconds -->\n"
+            "Prompt:\n%s\nStdin:\n%s\nStdout:\n%s\nStderr:\n%s\n",
+            action.uuid,
+            action.time_started,
+            action.time_elapsed,
+            action.prompt_ps1,
+            action.command_input,
+            action.command_output,
+            action.command_error,
         )
 
-    click.echo(click.style("Pasta done.", fg="red", bold=True))
+    click.echo(_BANNER_DONE)
 
 
 @root.command(name="config")
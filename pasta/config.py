@@ -1,23 +1,39 @@
 from __future__ import annotations
 
+import functools
 import logging
 import os
 import pathlib
 import re
-import tomllib
 import typing as t
+from collections import abc
 
 import pydantic
 
 __config__ = f"{__package__}.toml"
 
 
+_ZSH_COMMAND = re.compile(r"zsh")
+_ZSH_PATTERN = re.compile(r"\w+\r\r")
+
+
 class PromptRule(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(frozen=True)
+
     command: t.Pattern[str]
     description: str = ""
     pattern: t.Pattern[str]
 
 
+_DEFAULT_PROMPT_RULES = (
+    PromptRule(
+        command=_ZSH_COMMAND,
+        description="zle reset-prompt",
+        pattern=_ZSH_PATTERN,
+    ),
+)
+
+
 class LogConfig(pydantic.BaseModel):
     level: int = logging.INFO
     directory: str | os.PathLike[str] = str(
@@ -33,84 +49,134 @@ class LogConfig(pydantic.BaseModel):
     model_config = pydantic.ConfigDict(arbitrary_types_allowed=True)
 
 
-class Config(pydantic.BaseModel):
-    """Config is a TOML configuration for Pasta.
+@functools.singledispatch
+def _dumps_value(value: t.Any, out: list[str]) -> None:
+    """Write a TOML value, dispatched on the value type."""
+    raise TypeError(f"{type(value).__name__} {value!r} is not supported")
+
+
+@_dumps_value.register(bool)
+def _(value: bool, out: list[str]) -> None:
+    out.append("true" if value else "false")
+
+
+@_dumps_value.register(int)
+@_dumps_value.register(float)
+def _(value: int | float, out: list[str]) -> None:
+    out.append(str(value))
+
+
+@_dumps_value.register(str)
+def _(value: str, out: list[str]) -> None:
+    out.append(f'"{value}"')
+
 
-    Attributes
-    ----------
-    plugins
-        List of Python modules to load.
-    """
+@_dumps_value.register(re.Pattern)
+def _(value: re.Pattern[str], out: list[str]) -> None:
+    out.append(f"'{value.pattern}'")
+
+
+@_dumps_value.register(list)
+def _(value: list[t.Any], out: list[str]) -> None:
+    out.append("[")
+    for i, v in enumerate(value):
+        if i:
+            out.append(", ")
+        _dumps_value(v, out)
+    out.append("]")
+
+
+@_dumps_value.register(abc.Mapping)
+def _(value: abc.Mapping[str, t.Any], out: list[str]) -> None:
+    if len(value) == 0:
+        out.append("{}")
+        return
+
+    out.append("{")
+    for k, v in value.items():
+        out.append(f"\n\t{k} = ")
+        _dumps_value(v, out)
+        out.append(",")
+    out.append("\n}")
+
+
+class Config(pydantic.BaseModel):
+    """Config is a TOML configuration for Pasta."""
 
     logging: LogConfig = pydantic.Field(default_factory=LogConfig)
-    prompt: list[PromptRule] = [
-        PromptRule(
-            command=re.compile(r"zsh"),
-            description="zle reset-prompt",
-            pattern=re.compile(r"\w+\r\r"),
-        ),
-    ]
+    prompt: list[PromptRule] = pydantic.Field(
+        default_factory=lambda: list(_DEFAULT_PROMPT_RULES)
+    )
 
-    @classmethod
-    def _dumps_value(cls, value: t.Any) -> str:
-        if isinstance(value, bool):
-            return "true" if value else "false"
-        elif isinstance(value, (int, float)):
-            return str(value)
-        elif isinstance(value, str):
-            return f'"{value}"'
-        elif isinstance(value, t.Pattern):
-            return f"'{value.pattern}'"
-        elif isinstance(value, list):
-            return f"[{', '.join(cls._dumps_value(v) for v in value)}]"
-        elif isinstance(value, t.Mapping):
-            if len(value) == 0:
-                return "{}"
-
-            toml = ["{"]
-            for k, v in value.items():
-                toml.append(f"\t{k} = {cls._dumps_value(v)},")
-
-            return "\n".join(toml + ["}"])
-        else:
-            raise TypeError(f"{type(value).__name__} {value!r} is not supported")
+    @staticmethod
+    def _items(
+        data: t.Mapping[str, t.Any] | pydantic.BaseModel,
+        exclude_unset: bool = False,
+    ) -> t.Iterator[tuple[str, t.Any]]:
+        if not isinstance(data, pydantic.BaseModel):
+            yield from data.items()
+            return
+
+        fields_set = data.model_fields_set
+        for name in type(data).model_fields:
+            if exclude_unset and name not in fields_set:
+                continue
+
+            value = getattr(data, name)
+            if value is not None:
+                yield name, value
 
     @classmethod
     def _dumps_table(
         cls,
-        data: t.Mapping[str, t.Any],
+        data: t.Mapping[str, t.Any] | pydantic.BaseModel,
+        out: list[str],
         table: str = "",
-    ) -> str:
-        toml = []
-        for key, value in data.items():
-            if isinstance(value, t.Mapping):
+        exclude_unset: bool = False,
+    ) -> None:
+        # tables are separated by a blank line, except at the start of a table
+        start = len(out)
+        for key, value in cls._items(data, exclude_unset):
+            if isinstance(value, (t.Mapping, pydantic.BaseModel)):
                 table_key = f"{table}.{key}" if table else key
-                toml.append(f"\n[{table_key}]\n{cls._dumps_table(value, table_key)}")
+                if len(out) > start:
+                    out.append("\n")
+                out.append(f"[{table_key}]\n")
+                n = len(out)
+                cls._dumps_table(value, out, table_key, exclude_unset)
+                if len(out) == n:
+                    out.append("\n")
             elif isinstance(value, list):
                 for obj in value:
-                    if isinstance(obj, t.Mapping):
+                    if isinstance(obj, (t.Mapping, pydantic.BaseModel)):
                         table_key = f"{table}.{key}" if table else key
-                        toml.append(f"\n[[{table_key}]]")
-                        for k, v in obj.items():
-                            toml.append(f"{k} = {cls._dumps_value(v)}")
+                        if len(out) > start:
+                            out.append("\n")
+                        out.append(f"[[{table_key}]]\n")
+                        for k, v in cls._items(obj, exclude_unset):
+                            out.append(f"{k} = ")
+                            _dumps_value(v, out)
+                            out.append("\n")
                     else:
-                        toml.append(f"{key} = {cls._dumps_value(value)}")
+                        out.append(f"{key} = ")
+                        _dumps_value(value, out)
+                        out.append("\n")
                         break
             else:
-                toml.append(f"{key} = {cls._dumps_value(value)}")
-
-        return "\n".join(toml).lstrip("\n")
+                out.append(f"{key} = ")
+                _dumps_value(value, out)
+                out.append("\n")
 
     def dumps(self, comment: bool = False) -> str:
         """Dump to a TOML string."""
+        out: list[str] = []
         if comment:
-            data = self.model_dump(exclude_none=True)
-            document = self._dumps_table(data, table=__package__)
-            return "# " + "\n# ".join(document.split("\n"))
+            self._dumps_table(self, out, table=__package__)
+            document = "".join(out).removesuffix("\n")
+            return "# " + document.replace("\n", "\n# ")
 
-        data = self.model_dump(exclude_none=True, exclude_unset=True)
-        document = self._dumps_table(data, table=__package__)
-        return document
+        self._dumps_table(self, out, table=__package__, exclude_unset=True)
+        return "".join(out).removesuffix("\n")
 
     @classmethod
     def load(cls, handle: t.BinaryIO) -> Config:
@@ -129,6 +195,8 @@ class Config(pydantic.BaseModel):
         ------
         TOMLDecodeError
         """
+        import tomllib
+
         data = tomllib.load(handle)
         return cls.model_validate(data.get(__package__, {}))
 
@@ -149,9 +217,34 @@ class Config(pydantic.BaseModel):
         ------
         TOMLDecodeError
         """
+        import tomllib
+
         data = tomllib.loads(document)
         return cls.model_validate(data.get(__package__, {}))
 
+    @classmethod
+    def load_path(cls, path: str | os.PathLike[str]) -> Config:
+        """Load a TOML file by path, reusing the parsed config until the file changes.
+
+        Parameters
+        ----------
+        path
+            TOML file path.
+
+        Returns
+        -------
+        Config.
+
+        Raises
+        ------
+        OSError
+        TOMLDecodeError
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        # copy since callers may override settings in place
+        return _load_path(path, stat.st_mtime_ns, stat.st_size).model_copy(deep=True)
+
     @classmethod
     def find(cls) -> str | os.PathLike[str] | None:
         """Find a config.
@@ -165,22 +258,36 @@ class Config(pydantic.BaseModel):
         -------
         Config path if found.
         """
-        candidate = pathlib.Path.cwd().joinpath(__config__)
-        if candidate.exists():
-            return candidate
-
-        XDG_CONFIG_HOME = pathlib.Path(
-            os.environ.get("XDG_CONFIG_HOME", pathlib.Path.home().joinpath(".config"))
+        config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.join(
+            os.path.expanduser("~"), ".config"
         )
+        return _find(os.getcwd(), config_home)
 
-        usrpath = XDG_CONFIG_HOME.joinpath(__package__, __config__)
-        if usrpath.exists():
-            return usrpath
 
-        root_dir = os.path.abspath("/")
-        while str(candidate.parent.parent) != root_dir:
-            candidate = candidate.parent.parent.joinpath(__config__)
-            if candidate.exists():
-                return candidate
+@functools.lru_cache(maxsize=8)
+def _load_path(path: str, mtime_ns: int, size: int) -> Config:
+    """Load a config, memoized per file path, modification time, and size."""
+    with open(path, mode="rb") as handle:
+        return Config.load(handle)
+
+
+def _find(cwd: str, config_home: str) -> str | None:
+    """Find a config from a working directory and config home."""
+    candidate = os.path.join(cwd, __config__)
+    if os.path.exists(candidate):
+        return candidate
+
+    usrpath = os.path.join(config_home, __package__, __config__)
+    if os.path.exists(usrpath):
+        return usrpath
+
+    root_dir = os.path.abspath("/")
+    directory = os.path.dirname(cwd)
+    while directory != root_dir:
+        candidate = os.path.join(directory, __config__)
+        if os.path.exists(candidate):
+            return candidate
+
+        directory = os.path.dirname(directory)
 
-        return None
\ No newline at end of file
+    return None
@@ -1,28 +1,85 @@
 """Pty code."""
 from __future__ import annotations
 
+import array
 import contextlib
 import errno
 import fcntl
+import functools
 import logging
 import os
 import pty
-import select
+import selectors
 import shlex
 import shutil
 import signal
-import struct
 import subprocess
 import sys
 import termios
+import time
 import tty
-import types
 import typing as t
 from collections import abc
 
 from . import errors, shell
 from .config import Config
 
+_ECHO = termios.ECHO
+_TCSADRAIN = termios.TCSADRAIN
+_TIOCGWINSZ = getattr(termios, "TIOCGWINSZ", 1074295912)
+_TIOCSWINSZ = getattr(termios, "TIOCSWINSZ", -2146929561)
+
+# window size (rows, cols, xpixel, ypixel) reused by every TIOCGWINSZ/TIOCSWINSZ
+_WINSIZE = array.array("H", [0, 0, 0, 0])
+
+# minimum seconds between resizing the pts
+_RESIZE_INTERVAL = 0.1
+
+
+@functools.lru_cache(maxsize=64)
+def _tokenize(cmd: str) -> tuple[str, ...]:
+    """Split a shell-quoted command into argv, memoized per command."""
+    return tuple(shlex.split(cmd))
+
+
+@functools.lru_cache(maxsize=64)
+def _which_on(cmd: str, path: str | None) -> str:
+    """Resolve a command name on a search path, memoized per command and path."""
+    exe = shutil.which(cmd, path=path)
+    if exe is None:
+        # raise rather than return, so a miss is not cached
+        raise FileNotFoundError(cmd)
+
+    return exe
+
+
+def _which(cmd: str) -> str | None:
+    """Resolve a command name on the current $PATH."""
+    try:
+        return _which_on(cmd, os.environ.get("PATH"))
+    except FileNotFoundError:
+        return None
+
+
+# read buffers recycled across spools
+_BUFFERS: list[bytearray] = []
+_BUFFERS_MAX = 8
+
+
+def _get_buffer(size: int) -> bytearray:
+    """Take a read buffer of a size from the pool, or allocate one."""
+    for i, buf in enumerate(_BUFFERS):
+        if len(buf) == size:
+            return _BUFFERS.pop(i)
+
+    return bytearray(size)
+
+
+def _put_buffer(buf: bytearray) -> None:
+    """Return a read buffer to the pool."""
+    if len(_BUFFERS) < _BUFFERS_MAX:
+        _BUFFERS.append(buf)
+
 
 class PseudoTerminal:
     """PseudoTerminal is a subprocess-based pty.
@@ -33,44 +90,20 @@ class PseudoTerminal:
         Optional logger for events.
     """
 
-    def __init__(self, config: Config, logger: logging.Logger | None = None) -> None:
+    def __init__(
+        self,
+        config: Config,
+        logger: logging.Logger | logging.LoggerAdapter | None = None,
+    ) -> None:
         self.config = config
         self.logger = logger
 
     @staticmethod
-    def _get_echo(fd: int) -> bool:
-        """Check if the terminal is in echo mode.
-
-        Echo mode echoes input keystrokes back to the output.
-
-        Parameters
-        ----------
-        fd
-            Terminal file descriptor.
-
-        Returns
-        -------
-        Truthful.
-
-        Raises
-        ------
-        IOError
-            If the file descriptor is not a supported terminal.
-        """
-        try:
-            attr = termios.tcgetattr(fd)
-        except termios.error as err:
-            if err.args[0] == errno.EINVAL:
-                raise IOError(
-                    err.args[0],
-                    f"{err.args[1]}: Unable to get terminal echo: '{sys.platform}'",
-                )
-            raise
-
-        return bool(attr[3] & termios.ECHO)
-
-    @staticmethod
-    def _set_echo(fd: int, value: bool, logger: logging.Logger | None = None) -> None:
+    def _set_echo(
+        fd: int,
+        value: bool,
+        logger: logging.Logger | logging.LoggerAdapter | None = None,
+    ) -> bool:
         """Set a terminal file descriptor to or form echo mode.
 
         Echo mode echoes input keystrokes back to the output.
@@ -84,6 +117,10 @@ class PseudoTerminal:
         logger
             Optional logger.
 
+        Returns
+        -------
+        If the echo mode changed.
+
         Raises
         ------
         IOError
@@ -98,20 +135,22 @@ class PseudoTerminal:
                 raise IOError(err.args[0], "%s: %s." % (err.args[1], errmsg))
             raise
 
-        if value:
-            attr[3] = attr[3] | termios.ECHO
-        else:
-            attr[3] = attr[3] & ~termios.ECHO
+        lflag = attr[3] | _ECHO if value else attr[3] & ~_ECHO
+        if lflag == attr[3]:
+            return False
 
+        attr[3] = lflag
         try:
-            termios.tcsetattr(fd, termios.TCSADRAIN, attr)
+            termios.tcsetattr(fd, _TCSADRAIN, attr)
         except IOError as err:
             if err.args[0] == errno.EINVAL:
                 raise IOError(err.args[0], "%s: %s." % (err.args[1], errmsg))
             raise
 
         if logger is not None:
-            logger.debug("Echo mode {}: {}".format(fd, "on" if value else "off"))
+            logger.debug("Echo mode %d: %s", fd, "on" if value else "off")
+
+        return True
 
     @staticmethod
     def _get_term_winsize(fd: int) -> tuple[t.Any, ...]:
@@ -129,17 +168,15 @@ class PseudoTerminal:
         cols
             Terminal cell column count.
         """
-        TIOCGWINSZ = getattr(termios, "TIOCGWINSZ", 1074295912)
-        s = struct.pack("HHHH", 0, 0, 0, 0)
-        x = fcntl.ioctl(fd, TIOCGWINSZ, s)
-        return struct.unpack("HHHH", x)[0:2]
+        fcntl.ioctl(fd, _TIOCGWINSZ, _WINSIZE, True)
+        return _WINSIZE[0], _WINSIZE[1]
 
     @staticmethod
     def _set_term_winsize(
         fd: int,
         rows: int,
         cols: int,
-        logger: logging.Logger | None = None,
+        logger: logging.Logger | logging.LoggerAdapter | None = None,
     ) -> None:
         """Set the terminal window size.
 
@@ -155,20 +192,22 @@ class PseudoTerminal:
             Optional logger.
         """
         if logger is not None:
-            logger.debug("Resizing {}: {}x{}".format(fd, cols, rows))
+            logger.debug("Resizing %d: %dx%d", fd, cols, rows)
 
-        TIOCSWINSZ = getattr(termios, "TIOCSWINSZ", -2146929561)
-        s = struct.pack("HHHH", rows, cols, 0, 0)
-        fcntl.ioctl(fd, TIOCSWINSZ, s)
+        _WINSIZE[0] = rows
+        _WINSIZE[1] = cols
+        _WINSIZE[2] = 0
+        _WINSIZE[3] = 0
+        fcntl.ioctl(fd, _TIOCSWINSZ, _WINSIZE, True)
 
     @classmethod
-    def _resize_term_factory(
+    def _resize_term(
         cls,
         parent_fd: int,
         child_fd: int,
-        logger: logging.Logger | None = None,
-    ) -> signal._HANDLER:
-        """Return a SIGNWINCH signal handler that resizes terminal windows.
+        logger: logging.Logger | logging.LoggerAdapter | None = None,
+    ) -> None:
+        """Resize a child terminal window to the parent terminal window size.
 
         Parameters
         ----------
@@ -178,33 +217,108 @@ class PseudoTerminal:
             A child terminal file descriptor.
         logger
             Optional logger.
+        """
+        rows, cols = cls._get_term_winsize(parent_fd)
+        cls._set_term_winsize(child_fd, rows, cols, logger=logger)
+
+    @staticmethod
+    def _set_events(sel: selectors.BaseSelector, fd: int, events: int) -> None:
+        """Update the events a selector waits on for a file descriptor.
+
+        Parameters
+        ----------
+        sel
+            Selector.
+        fd
+            File descriptor.
+        events
+            Selector event mask, unregistering the file descriptor if empty.
+        """
+        key = sel.get_map().get(fd)
+        if key is None:
+            if events:
+                sel.register(fd, events)
+        elif not events:
+            sel.unregister(fd)
+        elif key.events != events:
+            sel.modify(fd, events)
+
+    @staticmethod
+    def _fit_pipe(fd: int, bufsize: int, readsize: int) -> int:
+        """Grow a pipe to hold a read buffer and fit the read size to its capacity.
+
+        Parameters
+        ----------
+        fd
+            Pipe file descriptor.
+        bufsize
+            Read buffer size the pipe should be able to hold.
+        readsize
+            Requested number of bytes to read from the pipe at a time.
+
+        Returns
+        -------
+        Number of bytes to read from the pipe at a time.
+        """
+        try:
+            if fcntl.fcntl(fd, fcntl.F_GETPIPE_SZ) < bufsize:
+                fcntl.fcntl(fd, fcntl.F_SETPIPE_SZ, bufsize)
+            capacity = fcntl.fcntl(fd, fcntl.F_GETPIPE_SZ)
+        except (AttributeError, OSError):
+            # not Linux, or above the unprivileged pipe size limit
+            return readsize
+
+        return min(readsize, capacity)
+
+    @staticmethod
+    def _drain(fd: int, buf: memoryview, readsize: int) -> tuple[bytes, bool]:
+        """Read a non-blocking file descriptor into a buffer until it would block.
+
+        Parameters
+        ----------
+        fd
+            Non-blocking file descriptor.
+        buf
+            Preallocated buffer, bounding the bytes read per call.
+        readsize
+            Number of bytes to read from the file descriptor at a time.
 
         Returns
         -------
-        Signal handler callback.
+        data
+            Bytes read.
+        eof
+            If the end of file was reached.
         """
+        n = 0
+        eof = False
+        while n < len(buf):
+            try:
+                count = os.readv(fd, (buf[n : n + readsize],))
+            except BlockingIOError:
+                break
 
-        def handleSignal(signalNumber: int, _: types.FrameType | None) -> None:
-            """Handle a SIGNWINCH signal."""
-            if signalNumber != signal.SIGWINCH:
-                return
+            if not count:
+                eof = True
+                break
 
-            rows, cols = cls._get_term_winsize(parent_fd)
-            cls._set_term_winsize(child_fd, rows, cols, logger=logger)
+            n += count
+            if count < readsize:
+                break
 
-        return handleSignal
+        return bytes(buf[:n]), eof
 
     @contextlib.contextmanager
     def spool(
         self,
-        cmd: str,
+        cmd: str | abc.Sequence[str],
         env: dict[str, str] | None = None,
         cwd: os.PathLike | str | None = None,
         echo: bool = True,
         timeout: float | None = None,
-        bufsize: int = 8192,
+        bufsize: int = 65536,
         waterlevel: int = 4096,
-        readsize: int = 1024,
+        readsize: int = 65536,
         pass_fds: tuple[int, ...] = (),
         close_fds: bool = True,
         preexec_fn: t.Callable[..., t.Any] | None = None,
@@ -241,7 +355,8 @@ class PseudoTerminal:
         Parameters
         ----------
         cmd
-            Command to execute in the child process.
+            Command to execute in the child process, either a shell-quoted string or
+            an argv sequence.
         env
             Environment variables for the child process. By default inherits from
             parent process (forked).
@@ -254,7 +369,7 @@ class PseudoTerminal:
             Time to wait before forcibly closing the child process when streaming ends.
         bufsize
             Buffer size for the child process standard output and standard error file
-            descriptors.
+            descriptors, bounding the bytes read from a file descriptor per wakeup.
         waterlevel
             Number of bytes to buffer in the parent process before needing to write to
             streams and reset the buffer.
@@ -279,14 +394,20 @@ class PseudoTerminal:
             If the buffer size is less than 1.
             If the parent process standard input is not a TTY.
         """
-        # split the command into argv
-        args = shlex.split(cmd)
+        # split the command into argv, unless it already is one
+        args = list(_tokenize(cmd) if isinstance(cmd, str) else cmd)
 
         # ensure executable path
-        if exe := shutil.which(args[0]):
+        if os.sep in args[0]:
+            # a path is checked directly, which never walks $PATH
+            exe = shutil.which(args[0])
+        else:
+            exe = _which(args[0])
+
+        if exe:
             args[0] = exe
         else:
-            raise errors.PastaError("Command not found or executable: %s", exe)
+            raise errors.PastaError("Command not found or executable: %s", args[0])
 
         # validate buffer size
         if bufsize < 1:
@@ -312,65 +433,69 @@ class PseudoTerminal:
         # set standard input terminal to raw mode
         mode = termios.tcgetattr(stdin_fd)
         # set pts to echo mode
-        if echo != self._get_echo(pts):
-            try:
-                self._set_echo(pts, echo, logger=self.logger)
-                restore = True
-            except (IOError, termios.error) as err:
-                restore = False
-                if err.args[0] not in (errno.EINVAL, errno.ENOTTY):
-                    raise
+        restore = False
+        try:
+            restore = self._set_echo(pts, echo, logger=self.logger)
+        except (IOError, termios.error) as err:
+            if err.args[0] not in (errno.EINVAL, errno.ENOTTY):
+                raise
 
         if self.logger is not None:
             self.logger.debug("File descriptor echo mode: %s", "on" if echo else "off")
 
         proc = None
         blocking = False
+        sel = selectors.DefaultSelector()
+        wake_r, wake_w = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+        bufs: dict[int, memoryview] = {}
+        readsizes: dict[int, int] = {}
+        stdout_fd = stdout_w = stderr_fd = stderr_w = -1
+        pidfd = -1
+        winch = None
+        wakeup_fd = None
+        ts: shell.Typescript | None = None
         try:
             # start a child process
             if self.logger is not None:
-                self.logger.debug("Executing child process: %s", cmd)
+                self.logger.debug("Executing child process: %s", args)
                 if cwd is not None:
                     self.logger.debug("Child process workding directory: %s", cwd)
 
+            # child process pipes, only the child's ends are inherited
+            stdout_fd, stdout_w = os.pipe2(os.O_CLOEXEC)
+            stderr_fd, stderr_w = os.pipe2(os.O_CLOEXEC)
+
             proc = subprocess.Popen(
-                args[:],
+                args,
                 env=env,
                 cwd=cwd,
                 start_new_session=True,  # https://www.man7.org/linux/man-pages/man2/setsid.2.html
                 stdin=pts,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                bufsize=bufsize,
+                stdout=stdout_w,
+                stderr=stderr_w,
                 pass_fds=pass_fds,
                 close_fds=close_fds,
                 preexec_fn=preexec_fn,
             )
 
-            if self.logger is not None:
-                if proc.stdout is not None:
-                    self.logger.debug(
-                        "Child process output file descriptor: %d", proc.stdout.fileno()
-                    )
+            # close the child's pipe ends so reads see EOF once the child exits
+            os.close(stdout_w)
+            os.close(stderr_w)
+            stdout_w = stderr_w = -1
 
-                if proc.stderr is not None:
-                    self.logger.debug(
-                        "Child process error file descriptor: %d", proc.stderr.fileno()
-                    )
+            if self.logger is not None:
+                self.logger.debug("Child process output file descriptor: %d", stdout_fd)
+                self.logger.debug("Child process error file descriptor: %d", stderr_fd)
 
             # set the initial terminal size
             rows, cols = self._get_term_winsize(stdin_fd)
             self._set_term_winsize(pts, rows, cols)
 
-            # register the terminal resize signal handler
-            signal.signal(
-                signal.SIGWINCH,
-                self._resize_term_factory(
-                    stdin_fd,
-                    pts,
-                    logger=self.logger,
-                ),
-            )
+            # wake the loop on SIGWINCH to resize there, rather than resizing from a
+            # signal handler that may interrupt the loop at any point
+            winch = signal.signal(signal.SIGWINCH, lambda signalNumber, _: None)
+            wakeup_fd = signal.set_wakeup_fd(wake_w, warn_on_full_buffer=False)
+            sel.register(wake_r, selectors.EVENT_READ)
 
             # resolve EOF ANSI escape code
             try:
@@ -391,111 +516,160 @@ class PseudoTerminal:
             except termios.error:
                 restore = False
 
-            buf_i = b""
-            buf_p = b""
-            buf_o = b""
-            buf_e = b""
+            # pending ptm input, written from a head offset instead of re-slicing
+            buf_i = bytearray()
+            head = 0
 
             blocking = os.get_blocking(ptm)
             if blocking:
                 if self.logger is not None:
-                    self.logger.debug("Unblocking file descriptor: {}".format(ptm))
+                    self.logger.debug("Unblocking file descriptor: %d", ptm)
 
                 os.set_blocking(ptm, False)
 
-            while proc.poll() is None:
-                rfds: list[int] = []
-                wfds: list[int] = []
-
-                # add parent process stdin to readers if buf_i not above waterlevel
-                if len(buf_i) < waterlevel:
-                    rfds.append(stdin_fd)
-
-                # add ptm to readers if buf_p not above waterlevel
-                if len(buf_p) < waterlevel:
-                    rfds.append(ptm)
-
-                # always add child process stdout if being captured
-                if proc.stdout is not None:
-                    rfds.append(proc.stdout.fileno())
-
-                # always add child process stderr if being captured
-                if proc.stderr is not None:
-                    rfds.append(proc.stderr.fileno())
+            # preallocated read buffers, reused for every drain
+            bufs[ptm] = memoryview(_get_buffer(bufsize))
 
-                # add ptm to writers if buf_i has data
-                if len(buf_i) > 0:
-                    wfds.append(ptm)
+            # child process pipes are private to the parent, drain them until empty
+            pipes = {stdout_fd: shell.Event.STDOUT, stderr_fd: shell.Event.STDERR}
+            for fd in pipes:
+                os.set_blocking(fd, False)
+                sel.register(fd, selectors.EVENT_READ)
+                bufs[fd] = memoryview(_get_buffer(bufsize))
+                readsizes[fd] = self._fit_pipe(fd, bufsize, readsize)
 
-                rfds, wfds, _ = select.select(rfds, wfds, [])
+            # wake on child process exit rather than polling it every iteration
+            try:
+                pidfd = os.pidfd_open(proc.pid)
+            except (AttributeError, OSError):
+                # not Linux 5.3+, fall back to polling
+                pidfd = -1
+            else:
+                sel.register(pidfd, selectors.EVENT_READ)
+
+            # check the debug level once rather than on every loop iteration
+            trace = None
+            if self.logger is not None and self.logger.isEnabledFor(logging.DEBUG):
+                trace = self.logger
+
+            # a pending resize is applied at most once per interval
+            resize_at = None
+            resized_at = -_RESIZE_INTERVAL
+
+            # bind the constants the loop tests on every wakeup
+            can_read = selectors.EVENT_READ
+            can_write = selectors.EVENT_WRITE
+            event_stdin = shell.Event.STDIN
+
+            # always read ptm, read stdin while buf_i is below the waterlevel, and
+            # write ptm while buf_i has data, updating the selector on transitions
+            sel.register(ptm, can_read)
+            sel.register(stdin_fd, can_read)
+            reading = True
+            writing = False
+
+            while pidfd >= 0 or proc.poll() is None:
+                pending = len(buf_i) - head
+                if reading is not (pending < waterlevel):
+                    reading = not reading
+                    self._set_events(sel, stdin_fd, can_read if reading else 0)
+
+                if writing is not (pending > 0):
+                    writing = not writing
+                    sel.modify(ptm, can_read | can_write if writing else can_read)
+
+                # flush handler output before waiting on the next burst
+                ts.flush()
+                wait = None
+                if resize_at is not None:
+                    wait = max(0.0, resize_at - time.monotonic())
+
+                ready = {key.fd: mask for key, mask in sel.select(wait)}
+
+                # resize the pts after the parent process terminal was resized,
+                # coalescing the burst of signals sent while a window is dragged
+                if wake_r in ready and signal.SIGWINCH in os.read(wake_r, 512):
+                    if resize_at is None:
+                        resize_at = resized_at + _RESIZE_INTERVAL
+
+                if resize_at is not None and time.monotonic() >= resize_at:
+                    self._resize_term(stdin_fd, pts, logger=self.logger)
+                    resized_at = time.monotonic()
+                    resize_at = None
 
                 # read parent process stdin and copy data to buf_i
-                if stdin_fd in rfds:
-                    if self.logger is not None:
-                        self.logger.debug("Reading from file descriptor: %d", stdin_fd)
+                if ready.get(stdin_fd, 0) & can_read:
+                    if trace is not None:
+                        trace.debug("Reading from file descriptor: %d", stdin_fd)
 
                     data = os.read(stdin_fd, readsize)
                     if data:
                         if not echo:
-                            data = ts.wrap(shell.Event.STDIN, data)
+                            data = ts.wrap(event_stdin, data)
 
                         buf_i += data
 
-                # read ptm and copy data to buf_p (should be echoed pts only)
-                if ptm in rfds:
-                    if self.logger is not None:
-                        self.logger.debug("Reading from file descriptor: %d", ptm)
-
-                    data = os.read(ptm, readsize)
-                    if data:
-                        if echo:
-                            data = ts.wrap(shell.Event.STDIN, data)
-
-                        buf_p += data
-
-                # read child process stdout, intercept, and copy to buf_o
-                if (
-                    proc.stdout is not None
-                    and (stdout_fd := proc.stdout.fileno()) in rfds
-                ):
-                    if self.logger is not None:
-                        self.logger.debug("Reading from file descriptor: %d", stdout_fd)
+                # read ptm and intercept data (should be echoed pts only)
+                if ready.get(ptm, 0) & can_read:
+                    if trace is not None:
+                        trace.debug("Reading from file descriptor: %d", ptm)
 
                     try:
-                        data = os.read(stdout_fd, readsize)
-                        if data:
-                            data = ts.wrap(shell.Event.STDOUT, data)
-                            buf_o += data
-
-                    except OSError:
-                        # assume child process exited
+                        data, _ = self._drain(ptm, bufs[ptm], readsize)
+                    except OSError as err:
+                        # EIO once the pts side is gone, assume child process exited
+                        if err.errno != errno.EIO:
+                            raise
                         break
 
-                # read child process standard error, intercept, and copy to buffer
-                if (
-                    proc.stderr is not None
-                    and (stderr_fd := proc.stderr.fileno()) in rfds
-                ):
-                    if self.logger is not None:
-                        self.logger.debug("Reading from file descriptor: %d", stderr_fd)
+                    if data and echo:
+                        ts.wrap(event_stdin, data)
 
-                    try:
-                        data = os.read(stderr_fd, readsize)
-                        if data:
-                            data = ts.wrap(shell.Event.STDERR, data)
-                            buf_e += data
+                # read child process standard output and standard error and intercept
+                for fd, event in pipes.items():
+                    if fd not in ready:
+                        continue
 
-                    except OSError:
-                        # assume child process exited
-                        break
+                    if trace is not None:
+                        trace.debug("Reading from file descriptor: %d", fd)
+
+                    data, eof = self._drain(fd, bufs[fd], readsizes[fd])
+                    if data:
+                        ts.wrap(event, data)
+
+                    if eof:
+                        sel.unregister(fd)
 
                 # copy buf_i to ptm ("pass-through" parent process stdin to pts)
-                if ptm in wfds:
-                    if self.logger is not None:
-                        self.logger.debug("Writing to file descriptor: %d", ptm)
+                if ready.get(ptm, 0) & can_write:
+                    if trace is not None:
+                        trace.debug("Writing to file descriptor: %d", ptm)
+
+                    head += os.write(ptm, memoryview(buf_i)[head:])
+                    if head == len(buf_i):
+                        buf_i.clear()
+                        head = 0
+                    elif head >= waterlevel:
+                        del buf_i[:head]
+                        head = 0
+
+                # the child process exited, stop after handling the other events
+                if pidfd in ready:
+                    break
+
+            # collect output the child process wrote just before exiting
+            for fd, event in pipes.items():
+                if fd not in sel.get_map():
+                    continue
+
+                # a drain stops at bufsize bytes, repeat until the pipe is empty
+                eof = False
+                while not eof:
+                    data, eof = self._drain(fd, bufs[fd], readsizes[fd])
+                    if not data:
+                        break
 
-                    n = os.write(ptm, buf_i)
-                    buf_i = buf_i[n:]
+                    ts.wrap(event, data)
 
             # flush typescript
             ts.wrap(shell.Event.STDOUT, ts.eof, flush=True)
@@ -506,12 +680,22 @@ class PseudoTerminal:
                 proc.kill()
 
         finally:
+            # write out handler output, also when the loop was interrupted
+            if ts is not None:
+                with contextlib.suppress(OSError):
+                    ts.flush()
+
             # exit the child process if something unexpected happened
             if proc is not None:
-                try:
-                    retcode = proc.wait(timeout=timeout)
-                except subprocess.TimeoutExpired:
-                    retcode = proc.poll()
+                retcode = proc.poll()
+                if retcode is None:
+                    # ask the child process to exit, then kill it after the timeout
+                    proc.terminate()
+                    try:
+                        retcode = proc.wait(timeout=timeout)
+                    except subprocess.TimeoutExpired:
+                        proc.kill()
+                        retcode = proc.wait()
 
                 if self.logger is not None:
                     self.logger.debug(
@@ -527,5 +711,25 @@ class PseudoTerminal:
                         "Parent process input file descriptor restored: %d", stdin_fd
                     )
 
+            # restore the signal disposition
+            if wakeup_fd is not None:
+                signal.set_wakeup_fd(wakeup_fd)
+
+            if winch is not None:
+                signal.signal(signal.SIGWINCH, winch)
+
+            for view in bufs.values():
+                buf = t.cast(bytearray, view.obj)
+                view.release()
+                _put_buffer(buf)
+
+            sel.close()
+            for fd in (stdout_fd, stdout_w, stderr_fd, stderr_w):
+                if fd >= 0:
+                    os.close(fd)
+            if pidfd >= 0:
+                os.close(pidfd)
+            os.close(wake_r)
+            os.close(wake_w)
             os.close(pts)
             os.close(ptm)
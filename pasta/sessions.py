@@ -6,7 +6,7 @@ import hashlib
 # from . import actions
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Session:
     """Session is a subshell session."""
 
@@ -15,20 +15,26 @@ class Session:
 
     def fingerprint(self) -> bytes:
         """Return the Session subshell fingerprint."""
-        return hashlib.sha1().digest()
+        return hashlib.sha256().digest()[:20]
 
 class State:
     """State is a sessions stack."""
 
+    __slots__ = ("_sessions",)
+
     def __init__(self) -> None:
-        self._sessions: list[Session] = []
+        self._sessions: collections.deque[Session] = collections.deque()
         return
 
+    def __len__(self) -> int:
+        """Return the number of sessions on the stack."""
+        return len(self._sessions)
+
     def push(self, session: Session) -> None:
         self._sessions.append(session)
 
     def pop(self) -> Session:
-        return self.pop()
+        return self._sessions.pop()
 
-    def get(self, index: str) -> list[Session]:
-        return self._sessions
\ No newline at end of file
+    def get(self, index: int) -> Session:
+        return self._sessions[index]
@@ -1,26 +1,41 @@
 """A."""
 from __future__ import annotations
 
-import asyncio
 import enum
+import functools
+import itertools
 import logging
 import os
-import queue
-import re
-import readline
-import sys
 import termios
 import time
-import types
 import typing as t
 from collections import abc, deque
-from datetime import datetime
-
-import stransi
+from datetime import datetime, timezone
 
 from . import actions
 from .config import Config
 
+# stands in when no logger is given, so log calls need no guard
+_NULL_LOGGER = logging.getLogger(__name__ + ".null")
+_NULL_LOGGER.addHandler(logging.NullHandler())
+_NULL_LOGGER.propagate = False
+_NULL_LOGGER.disabled = True
+
+
+def _isspace(chunks: deque[bytes]) -> bool:
+    """Return whether every chunk of a buffer is whitespace."""
+    return all(chunk.isspace() for chunk in chunks)
+
+
+def _compose(
+    handlers: abc.Sequence[t.Callable[[bytes], bytes]],
+) -> t.Callable[[bytes], bytes] | None:
+    """Compose handlers into one callable, None when there are no handlers."""
+    if not handlers:
+        return None
+
+    return functools.reduce(lambda f, g: lambda b: g(f(b)), handlers)
+
 
 class Event(enum.IntEnum):
     STDIN = 0
@@ -28,6 +43,11 @@ class Event(enum.IntEnum):
     STDERR = 2
 
 
+def _endswith(chunks: deque[bytes], suffix: bytes) -> bool:
+    """Return whether the last chunk of a buffer ends with a one byte suffix."""
+    return bool(chunks) and chunks[-1].endswith(suffix)
+
+
 class Typescript:
     """Typescript is a shell data reader.
 
@@ -40,6 +60,27 @@ class Typescript:
 
     """
 
+    __slots__ = (
+        "config",
+        "eof",
+        "_eof_crlf",
+        "logger",
+        "_log",
+        "_dump",
+        "buf_i",
+        "buf_ps1",
+        "buf_o",
+        "buf_e",
+        "buf_c",
+        "_start_ns",
+        "_start_mono",
+        "handlers",
+        "_pipelines",
+        "flushers",
+        "actions",
+        "_dispatch",
+    )
+
     linesep: bytes = os.linesep.encode("ascii")
     crlf: bytes = "\r\n".encode("ascii")
 
@@ -49,22 +90,56 @@ class Typescript:
         eof: bytes = bytes([termios.CEOF]),
         histsize: int = 1000,
         ps1: bool = False,
-        logger: logging.Logger | None = None,
+        logger: logging.Logger | logging.LoggerAdapter | None = None,
     ) -> None:
         self.config = config
         self.eof = eof
-        self.logger = logger
-        self.buf_i = b""
-        self.buf_ps1 = b""
-        self.buf_o = b""
-        self.buf_e = b""
-        self.buf_c = b""
-        self.start_time = datetime.utcnow()
-        self.handlers = {}
+        self._eof_crlf = eof + self.crlf
+        self.logger = logger if logger is not None else _NULL_LOGGER
+        self._log = self.logger.info
+        # chunk hex dumps are only built when INFO records are kept
+        self._dump = self.logger.isEnabledFor(logging.INFO)
+        # buffers are chunk queues, joined once when an action is emitted
+        self.buf_i = deque[bytes]()
+        self.buf_ps1 = deque[bytes]()
+        self.buf_o = deque[bytes]()
+        self.buf_e = deque[bytes]()
+        # command output order, sharing the chunks queued in buf_o and buf_e
+        self.buf_c = deque[bytes]()
+        # wall clock start for reporting, monotonic start for elapsed time
+        self._start_ns = time.time_ns()
+        self._start_mono = time.monotonic()
+        self.handlers: tuple[list[t.Callable[[bytes], bytes]], ...] = tuple(
+            [] for _ in Event
+        )
+        # handlers precomposed per Event value, rebuilt by addHandler
+        self._pipelines: list[t.Callable[[bytes], bytes] | None] = [None for _ in Event]
+        self.flushers: list[t.Callable[[], None]] = []
         self.actions = deque[actions.Action](maxlen=histsize)
+        # stream wrappers indexed by Event value
+        self._dispatch: tuple[t.Callable[[bytes], bytes], ...] = (
+            self._wrap_stdin,
+            self._wrap_stdout,
+            self._wrap_stderr,
+        )
+
+    @property
+    def start_time(self) -> datetime:
+        """Return the current command start time in UTC."""
+        return datetime.fromtimestamp(self._start_ns / 1e9, tz=timezone.utc)
 
     def addHandler(self, event: Event, handler: t.Callable[[bytes], bytes]) -> None:
-        self.handlers[event] = self.handlers.get(event, []) + [handler]
+        self.handlers[event].append(handler)
+        self._pipelines[event] = _compose(self.handlers[event])
+
+    def addFlusher(self, flusher: t.Callable[[], None]) -> None:
+        """Add a flusher, called with no arguments when the stream goes idle."""
+        self.flushers.append(flusher)
+
+    def flush(self) -> None:
+        """Flush handler output, called when the stream goes idle."""
+        for flusher in self.flushers:
+            flusher()
 
     def read(self) -> bytes:
         pass
@@ -77,79 +152,80 @@ class Typescript:
         yield actions.Action()
 
     def wrap(self, event: Event, b: bytes, flush: bool = False) -> bytes:
-        if handlers := self.handlers.get(event):
-            for handler in handlers:
-                b = handler(b)
-
-        match event:
-            case Event.STDIN:
-                if self.buf_i.endswith(b"\n") and self.buf_c:
-                    action = actions.Action(
-                        prompt_ps1=self.buf_ps1,
-                        command_input=self.buf_i,
-                        command_output=self.buf_o,
-                        command_error=self.buf_e,
-                        typescript=self.buf_ps1 + self.buf_i + self.buf_c,
-                        time_started=self.start_time,
-                        time_elapsed=datetime.utcnow().timestamp()
-                        - self.start_time.timestamp(),
-                    )
-                    self.actions.append(action)
-                    if self.logger is not None:
-                        self.logger.info("Command completed: %d", action.time_elapsed)
-
-                    self.buf_ps1 = b""
-                    self.buf_i = b""
-                    self.buf_o = b""
-                    self.buf_e = b""
-                    self.buf_c = b""
-                    if b == self.eof + self.crlf:
-                        return b""
-
-                if not self.buf_i and not self.buf_ps1 and not self.buf_c:
-                    self.start_time = datetime.utcnow()
-                    if self.logger is not None:
-                        self.logger.info("New command: %s", self.start_time.isoformat())
-
-                if not self.buf_i and self.buf_c and not self.buf_c.endswith(self.eof):
-                    if self.logger is not None:
-                        self.logger.info("Capturing PS1 w/ CRLF")
-
-                    self.buf_ps1 += b
-                else:
-                    if self.logger is not None:
-                        self.logger.info("Capturing command input " + b.hex())
-
-                    self.buf_i += b
-            case Event.STDOUT:
-                # command input is empty and command output is not EOF
-                if not self.buf_i and b != self.eof:
-                    self.buf_ps1 += b
-                else:
-                    if self.logger is not None:
-                        self.logger.info("Capturing command output " + b.hex())
-
-                    self.buf_o += b
-                    self.buf_c += b
-            case Event.STDERR:
-                if not self.buf_i:
-                    if self.logger is not None:
-                        self.logger.info("Capturing PS1")
-
-                    self.buf_ps1 += b
-                else:
-                    if self.logger is not None:
-                        self.logger.info("Capturing command error")
-
-                    self.buf_e += b
-                    self.buf_c += b
+        pipeline = self._pipelines[event]
+        if pipeline is not None:
+            b = pipeline(b)
+
+        if not b:
+            return b
+
+        return self._dispatch[event](b)
+
+    def _wrap_stdin(self, b: bytes) -> bytes:
+        if _endswith(self.buf_i, b"\n") and self.buf_c:
+            # a blank command with no output besides whitespace is not recorded
+            if not (_isspace(self.buf_i) and _isspace(self.buf_c)):
+                action = actions.Action(
+                    prompt_ps1=b"".join(self.buf_ps1),
+                    command_input=b"".join(self.buf_i),
+                    command_output=b"".join(self.buf_o),
+                    command_error=b"".join(self.buf_e),
+                    typescript=b"".join(
+                        itertools.chain(self.buf_ps1, self.buf_i, self.buf_c)
+                    ),
+                    time_started_ns=self._start_ns,
+                    time_elapsed=time.monotonic() - self._start_mono,
+                )
+                self.actions.append(action)
+                self._log("Command completed: %d", action.time_elapsed)
+
+            self.buf_ps1.clear()
+            self.buf_i.clear()
+            self.buf_o.clear()
+            self.buf_e.clear()
+            self.buf_c.clear()
+            if b == self._eof_crlf:
+                return b""
+
+        if not self.buf_i and not self.buf_ps1 and not self.buf_c:
+            self._start_ns = time.time_ns()
+            self._start_mono = time.monotonic()
+            self._log("New command: %d", self._start_ns)
+
+        if not self.buf_i and self.buf_c and not _endswith(self.buf_c, self.eof):
+            self._log("Capturing PS1 w/ CRLF")
+
+            self.buf_ps1.append(b)
+        else:
+            if self._dump:
+                self._log("Capturing command input %s", b.hex())
+
+            self.buf_i.append(b)
+
+        return b
+
+    def _wrap_stdout(self, b: bytes) -> bytes:
+        # command input is empty and command output is not EOF
+        if not self.buf_i and b != self.eof:
+            self.buf_ps1.append(b)
+        else:
+            if self._dump:
+                self._log("Capturing command output %s", b.hex())
+
+            self.buf_o.append(b)
+            self.buf_c.append(b)
 
         return b
 
-    # def tokenize(self) -> bytes:
-    #     """A."""
-    #     try:
-    #         b = await anext(self.stream)
-    #         return b
-    #     except StopAsyncIteration:
-    #         return b""
\ No newline at end of file
+    def _wrap_stderr(self, b: bytes) -> bytes:
+        if not self.buf_i:
+            self._log("Capturing PS1")
+
+            self.buf_ps1.append(b)
+        else:
+            self._log("Capturing command error")
+
+            self.buf_e.append(b)
+            self.buf_c.append(b)
+
+        return b
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from pasta import cmd
+
+
+def test_output_buffer_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    writes: list[tuple[int, bytes]] = []
+
+    def writev(fd: int, buffers: list[bytes]) -> int:
+        data = b"".join(buffers)
+        writes.append((fd, data))
+        return len(data)
+
+    monkeypatch.setattr(os, "writev", writev)
+    buf = cmd._OutputBuffer()
+    buf.write(1, b"a")
+    buf.write(1, b"b")
+    buf.write(2, b"c")
+    buf.write(1, b"d")
+    buf.flush()
+    assert writes == [(1, b"ab"), (2, b"c"), (1, b"d")]
+
+
+def test_output_buffer_short_write(monkeypatch: pytest.MonkeyPatch) -> None:
+    writes: list[bytes] = []
+
+    def writev(fd: int, buffers: list[bytes]) -> int:
+        writes.append(buffers[0][:2])
+        return 2
+
+    def write(fd: int, data: bytes) -> int:
+        writes.append(bytes(data[:3]))
+        return min(len(data), 3)
+
+    monkeypatch.setattr(os, "writev", writev)
+    monkeypatch.setattr(os, "write", write)
+    buf = cmd._OutputBuffer()
+    buf.write(1, b"hello")
+    buf.write(1, b" world")
+    buf.flush()
+    assert b"".join(writes) == b"hello world"
+    assert buf.size == 0
+    assert not buf.chunks
@@ -0,0 +1,21 @@
+import uuid
+
+import pytest
+
+from pasta import sessions
+
+
+def test_state() -> None:
+    state = sessions.State()
+    first = sessions.Session(id=uuid.uuid4())
+    second = sessions.Session(id=uuid.uuid4())
+    state.push(first)
+    state.push(second)
+    assert len(state) == 2
+    assert state.get(0) is first
+    assert state.get(-1) is second
+    assert state.pop() is second
+    assert state.pop() is first
+    assert len(state) == 0
+    with pytest.raises(IndexError):
+        state.pop()
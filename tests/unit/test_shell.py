@@ -0,0 +1,28 @@
+from pasta import shell
+from pasta.config import Config
+
+
+def test_typescript_skips_blank_command() -> None:
+    ts = shell.Typescript(Config())
+    ts.wrap(shell.Event.STDOUT, b"$ ")
+    ts.wrap(shell.Event.STDIN, b"\r\n")
+    ts.wrap(shell.Event.STDOUT, b"\r\n")
+    ts.wrap(shell.Event.STDIN, b"ls\n")
+    ts.wrap(shell.Event.STDOUT, b"pasta\n$ ")
+    ts.wrap(shell.Event.STDIN, b"exit")
+    assert len(ts.actions) == 1
+    assert ts.actions[0].command_input == b"ls\n"
+    assert ts.actions[0].command_output == b"pasta\n$ "
+
+
+def test_typescript_keeps_output_after_blank_command() -> None:
+    ts = shell.Typescript(Config())
+    ts.wrap(shell.Event.STDIN, b"./scan.sh\n")
+    ts.wrap(shell.Event.STDOUT, b"scanning\n")
+    ts.wrap(shell.Event.STDIN, b"\n")
+    ts.wrap(shell.Event.STDOUT, b"port 443 open\nscan done\n$ ")
+    ts.wrap(shell.Event.STDIN, b"id\n")
+    assert [action.command_output for action in ts.actions] == [
+        b"scanning\n",
+        b"port 443 open\nscan done\n$ ",
+    ]